@@ -28,10 +28,18 @@ Usage:
 import os
 import re
 import operator
+import multiprocessing
+import pickle
+import queue
+import shlex
 import subprocess
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
 from optparse import OptionParser
-import tempfile
 from functools import reduce
+from itertools import chain
 
 from nltk.internals import find_binary
 
@@ -45,6 +53,7 @@ from nltk.sem.logic import (
 from nltk.sem.drt import (
     DRS,
     DrtApplicationExpression,
+    DrtConstantExpression,
     DrtEqualityExpression,
     DrtNegatedExpression,
     DrtOrExpression,
@@ -55,6 +64,16 @@ from nltk.sem.drt import (
 )
 
 
+_ENCODING = "utf-8"
+"""The encoding used to talk to ``candc`` and ``boxer``."""
+
+_BRACKET_RE = re.compile(rb"[\[\]]")
+
+# Paths found by ``Boxer._find_binary``, shared by all ``Boxer`` instances
+_binary_cache = {}
+_binary_cache_lock = threading.Lock()
+
+
 class Boxer(object):
     """
     This class is an interface to Johan Bos's program Boxer, a wide-coverage
@@ -68,6 +87,9 @@ class Boxer(object):
         bin_dir=None,
         verbose=False,
         resolve=True,
+        persistent=False,
+        cache_size=0,
+        timeout=120,
     ):
         """
         :param boxer_drs_interpreter: A class that converts from the
@@ -79,6 +101,14 @@ class Boxer(object):
         unified, but only if this can be done in a meaning-preserving manner.
         :param resolve: When set to true, Boxer will resolve all anaphoric DRSs and perform merge-reduction.
         Resolution follows Van der Sandt's theory of binding and accommodation.
+        :param persistent: When set to true, the ``candc`` process is started
+        once and kept running between calls, so that its models are only loaded
+        once.  Call ``close()`` to stop it.
+        :param timeout: The number of seconds a persistent ``candc`` may print
+        nothing before it is taken to be stuck, killed, and an error raised.
+        :param cache_size: The number of parsed discourses to remember, so that
+        parsing one of them again skips ``candc`` and ``boxer`` altogether.  The
+        least recently used discourses are forgotten first; 0 disables the cache.
         """
         if boxer_drs_interpreter is None:
             boxer_drs_interpreter = NltkDrtBoxerDrsInterpreter()
@@ -87,9 +117,53 @@ class Boxer(object):
         self._resolve = resolve
         self._elimeq = elimeq
 
+        self._persistent = persistent
+        self._timeout = timeout
+        # maps ``question`` to a (process, header lines, stdout queue) triple
+        self._candc_procs = {}
+        # maps ``n_jobs`` to a worker pool
+        self._pools = {}
+        weakref.finalize(self, _close, self._candc_procs, self._pools)
+
+        if not (_is_int(cache_size) and cache_size >= 0):
+            raise ValueError(
+                "cache_size must be a non-negative int, not {0!r}".format(cache_size)
+            )
+        self._cache_size = cache_size
+        # maps (discourse, discourse id, question) to a pickled DRS, so that
+        # changes made by callers to the DRSs they are given don't leak back
+        self._cache = OrderedDict()
+
         self.set_bin_dir(bin_dir, verbose)
 
+    def close(self):
+        """
+        Stop any ``candc`` process kept running by a persistent ``Boxer``,
+        and the worker processes started for ``n_jobs``.
+        """
+        _close(self._candc_procs, self._pools)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getstate__(self):
+        # running processes cannot be sent to worker processes
+        state = self.__dict__.copy()
+        state["_candc_procs"] = {}
+        state["_pools"] = {}
+        state["_cache"] = OrderedDict()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        weakref.finalize(self, _close, self._candc_procs, self._pools)
+
     def set_bin_dir(self, bin_dir, verbose=False):
+        self.close()
+        self._cache.clear()
         self._candc_bin = self._find_binary("candc", bin_dir, verbose)
         self._candc_models_path = os.path.normpath(
             os.path.join(self._candc_bin[:-5], "../models")
@@ -100,6 +174,11 @@ class Boxer(object):
         """
         Use Boxer to give a first order representation.
 
+        Every call starts ``candc`` and ``boxer`` afresh (unless the ``Boxer``
+        is persistent), which usually takes far longer than the parse itself;
+        use ``interpret_sents`` or ``interpret_multi_sents`` to parse many
+        discourses at once.
+
         :param input: str Input sentence to parse
         :param occur_index: bool Should predicates be occurrence indexed?
         :param discourse_id: str An identifier to be inserted to each occurrence-indexed predicate.
@@ -127,7 +206,13 @@ class Boxer(object):
         return d
 
     def interpret_sents(
-        self, inputs, discourse_ids=None, question=False, verbose=False
+        self,
+        inputs,
+        discourse_ids=None,
+        question=False,
+        verbose=False,
+        batch_size=None,
+        n_jobs=1,
     ):
         """
         Use Boxer to give a first order representation.
@@ -135,39 +220,224 @@ class Boxer(object):
         :param inputs: list of str Input sentences to parse as individual discourses
         :param occur_index: bool Should predicates be occurrence indexed?
         :param discourse_ids: list of str Identifiers to be inserted to each occurrence-indexed predicate.
+        :param batch_size: int Maximum number of discourses per ``candc``/``boxer`` call.
+        :param n_jobs: int Number of worker processes to parse with.
         :return: list of ``drt.DrtExpression``
         """
         return self.interpret_multi_sents(
-            [[input] for input in inputs], discourse_ids, question, verbose
+            [[input] for input in inputs],
+            discourse_ids,
+            question,
+            verbose,
+            batch_size,
+            n_jobs,
         )
 
     def interpret_multi_sents(
-        self, inputs, discourse_ids=None, question=False, verbose=False
+        self,
+        inputs,
+        discourse_ids=None,
+        question=False,
+        verbose=False,
+        batch_size=None,
+        n_jobs=1,
     ):
         """
         Use Boxer to give a first order representation.
 
+        All discourses are sent to a single invocation of ``candc`` and
+        ``boxer``, so the startup cost is only paid once.  Set ``batch_size``
+        to split very large inputs over several invocations instead.
+
+        With ``n_jobs`` greater than 1 the discourses are split between that
+        many worker processes, each running its own ``candc`` and ``boxer``.
+        The workers are kept until ``close()`` is called; if the ``Boxer`` is
+        persistent, so is the ``candc`` of each worker.
+
         :param inputs: list of list of str Input discourses to parse
         :param occur_index: bool Should predicates be occurrence indexed?
         :param discourse_ids: list of str Identifiers to be inserted to each occurrence-indexed predicate.
-        :return: ``drt.DrtExpression``
+        :param batch_size: int Maximum number of discourses per ``candc``/``boxer`` call.
+        :param n_jobs: int Number of worker processes to parse with.
+        :return: list of ``drt.DrtExpression``
+        """
+        return list(
+            self.interpret_multi_sents_iter(
+                inputs, discourse_ids, question, verbose, batch_size, n_jobs
+            )
+        )
+
+    def interpret_multi_sents_iter(
+        self,
+        inputs,
+        discourse_ids=None,
+        question=False,
+        verbose=False,
+        batch_size=None,
+        n_jobs=1,
+    ):
         """
+        Like ``interpret_multi_sents``, but yield each DRS, in input order,
+        as soon as it has been parsed rather than after the whole input.
+
+        :param inputs: list of list of str Input discourses to parse
+        :param discourse_ids: list of str Identifiers to be inserted to each occurrence-indexed predicate.
+        :param batch_size: int Maximum number of discourses per ``candc``/``boxer`` call.
+        :param n_jobs: int Number of worker processes to parse with.
+        :return: iterator of ``drt.DrtExpression``
+        """
+        # checked here rather than in the generator, so that bad arguments
+        # fail at the call
+        if batch_size is not None and not (_is_int(batch_size) and batch_size >= 1):
+            raise ValueError(
+                "batch_size must be a positive int or None, not {0!r}".format(
+                    batch_size
+                )
+            )
+        if not (_is_int(n_jobs) and n_jobs >= 1):
+            raise ValueError("n_jobs must be a positive int, not {0!r}".format(n_jobs))
+
         if discourse_ids is not None:
             assert len(inputs) == len(discourse_ids)
             assert reduce(operator.and_, (id is not None for id in discourse_ids))
             use_disc_id = True
         else:
-            discourse_ids = list(map(str, range(len(inputs))))
+            discourse_ids = [str(i) for i in range(len(inputs))]
             use_disc_id = False
 
+        return self._interpret_iter(
+            inputs, discourse_ids, use_disc_id, question, verbose, batch_size, n_jobs
+        )
+
+    def _interpret_iter(
+        self, inputs, discourse_ids, use_disc_id, question, verbose, batch_size, n_jobs
+    ):
+        """
+        Parse the discourses, taking those parsed before from the cache.
+
+        :return: iterator of ``drt.DrtExpression``, in input order
+        """
+        if not self._cache_size:
+            yield from self._interpret_uncached_iter(
+                inputs,
+                discourse_ids,
+                use_disc_id,
+                question,
+                verbose,
+                batch_size,
+                n_jobs,
+            )
+            return
+
+        keys = [
+            (tuple(input), id if use_disc_id else None, question)
+            for input, id in zip(inputs, discourse_ids)
+        ]
+        # look the hits up front: storing the misses may evict them later on
+        hits = {}
+        for i, key in enumerate(keys):
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                hits[i] = pickle.loads(self._cache[key])
+        misses = [i for i in range(len(inputs)) if i not in hits]
+
+        drss = self._interpret_uncached_iter(
+            [inputs[i] for i in misses],
+            [discourse_ids[i] for i in misses],
+            use_disc_id,
+            question,
+            verbose,
+            batch_size,
+            n_jobs,
+        )
+        for i, key in enumerate(keys):
+            if i in hits:
+                yield hits[i]
+            else:
+                drs = next(drss)
+                # failed parses are retried next time
+                if drs is not None:
+                    self._cache[key] = pickle.dumps(drs, pickle.HIGHEST_PROTOCOL)
+                    self._cache.move_to_end(key)
+                    if len(self._cache) > self._cache_size:
+                        self._cache.popitem(last=False)
+                yield drs
+
+    def _interpret_uncached_iter(
+        self, inputs, discourse_ids, use_disc_id, question, verbose, batch_size, n_jobs
+    ):
+        """
+        Run the discourses through ``candc`` and ``boxer``, bypassing the cache.
+
+        :return: iterator of ``drt.DrtExpression``, in input order
+        """
+        if batch_size is None:
+            # one batch per job
+            batch_size = max(-(-len(inputs) // n_jobs), 1)
+        batches = [
+            (
+                inputs[start : start + batch_size],
+                discourse_ids[start : start + batch_size],
+                use_disc_id,
+                question,
+                verbose,
+            )
+            for start in range(0, len(inputs), batch_size)
+        ]
+
+        if n_jobs > 1 and len(batches) > 1:
+            pool = self._pools.get(n_jobs)
+            if pool is None:
+                # kept until close(), so later calls skip starting the workers
+                pool = multiprocessing.Pool(n_jobs, _init_worker, (self,))
+                self._pools[n_jobs] = pool
+            # imap() hands the batches back in order
+            results = pool.imap(_interpret_batch, batches)
+            for batch, drs_dict in zip(batches, results):
+                for id in batch[1]:
+                    yield drs_dict.get(id, None)
+        else:
+            for batch in batches:
+                batch_ids = batch[1]
+                drs_dict = {}
+                next_idx = 0
+                for id, drs in self._interpret_batch_iter(*batch):
+                    drs_dict[id] = drs
+                    # boxer keeps the input order, so normally each DRS can be
+                    # yielded as soon as it arrives
+                    while next_idx < len(batch_ids) and batch_ids[next_idx] in drs_dict:
+                        yield drs_dict[batch_ids[next_idx]]
+                        next_idx += 1
+                for id in batch_ids[next_idx:]:
+                    yield drs_dict.get(id, None)
+
+    def _interpret_batch(self, inputs, discourse_ids, use_disc_id, question, verbose):
+        """
+        Run one batch of discourses through ``candc`` and ``boxer``.
+
+        :return: dict from discourse id to ``drt.DrtExpression``
+        """
+        return dict(
+            self._interpret_batch_iter(
+                inputs, discourse_ids, use_disc_id, question, verbose
+            )
+        )
+
+    def _interpret_batch_iter(
+        self, inputs, discourse_ids, use_disc_id, question, verbose
+    ):
+        """
+        Run one batch of discourses through ``candc`` and ``boxer``.
+
+        :return: iterator of (discourse id, ``drt.DrtExpression``) pairs
+        """
         candc_out = self._call_candc(inputs, discourse_ids, question, verbose=verbose)
         boxer_out = self._call_boxer(candc_out, verbose=verbose)
 
         #        if 'ERROR: input file contains no ccg/2 terms.' in boxer_out:
         #            raise UnparseableInputException('Could not parse with candc: "%s"' % input_str)
 
-        drs_dict = self._parse_to_drs_dict(boxer_out, use_disc_id)
-        return [drs_dict.get(id, None) for id in discourse_ids]
+        return self._parse_drs_lines(boxer_out, use_disc_id)
 
     def _call_candc(self, inputs, discourse_ids, question, verbose=False):
         """
@@ -184,39 +454,106 @@ class Boxer(object):
             "--candc-printer",
             "boxer",
         ]
-        return self._call(
-            "\n".join(
-                sum(
-                    (
-                        ["<META>'{0}'".format(id)] + d
-                        for d, id in zip(inputs, discourse_ids)
-                    ),
-                    [],
-                )
-            ),
-            self._candc_bin,
-            args,
-            verbose,
+        input_str = "\n".join(
+            chain.from_iterable(
+                chain(["<META>'{0}'".format(id)], d)
+                for d, id in zip(inputs, discourse_ids)
+            )
         )
+        if self._persistent:
+            return self._call_persistent_candc(input_str, question, args, verbose)
+        return self._call(input_str, self._candc_bin, args, verbose)
 
-    def _call_boxer(self, candc_out, verbose=False):
+    def _call_persistent_candc(self, input_str, question, args, verbose=False):
         """
-        Call the ``boxer`` binary with the given input.
+        Stream the given input through a long-lived ``candc`` process.
 
-        :param candc_out: str output from C&C parser
-        :return: stdout
+        The input is followed by an extra, empty discourse whose id is unique
+        to this batch; everything ``candc`` prints before that discourse is
+        the output for this batch.  The ``:-`` directives that ``candc``
+        only prints once, on startup, are prepended to every batch.
+
+        :param input_str: str ``<META>``-delimited discourses
+        :param question: bool Whether to use the question models
+        :param args: A list of command-line arguments.
+        :return: bytes stdout
         """
-        f = None
-        try:
-            fd, temp_filename = tempfile.mkstemp(
-                prefix="boxer-", suffix=".in", text=True
+        p, header, stdout = self._candc_procs.get(question, (None, None, None))
+        if p is None or p.poll() is not None:
+            if p is not None:
+                # it died since the last batch
+                _stop(p)
+            cmd = [self._candc_bin] + args
+            if verbose:
+                print("Starting:", " ".join(cmd))
+            p = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=None if verbose else subprocess.DEVNULL,
+                bufsize=-1,
             )
-            f = os.fdopen(fd, "w")
-            f.write(candc_out)
-        finally:
-            if f:
-                f.close()
+            header = []
+            # stdout is read by a thread so that a silent candc cannot block
+            # the read forever
+            stdout = queue.Queue()
+            reader = threading.Thread(target=_read_lines, args=(p.stdout, stdout))
+            reader.daemon = True
+            reader.start()
+            self._candc_procs[question] = (p, header, stdout)
+
+        if verbose:
+            print("Input:", input_str)
+        sentinel = "'{0}'".format(uuid.uuid4().hex)
+        data = "{0}\n<META>{1}\n".format(input_str, sentinel).encode(_ENCODING)
+        # stdin is fed by a thread so that candc never blocks on a full stdout
+        writer = threading.Thread(target=_write_and_flush, args=(p.stdin, data))
+        writer.daemon = True
+        writer.start()
+
+        # the echo of the sentinel discourse, i.e. "id('<sentinel>',[n])."
+        sentinel = "id({0},".format(sentinel).encode(_ENCODING)
+        lines = []
+        while True:
+            try:
+                line = stdout.get(timeout=self._timeout)
+            except queue.Empty:
+                p.kill()
+                line = None
+            if not line:
+                writer.join()
+                self._candc_procs.pop(question)
+                _stop(p)
+                raise Exception(
+                    "ERROR CALLING: {0} {1}\nReturncode: {2}{3}".format(
+                        self._candc_bin,
+                        " ".join(args),
+                        p.returncode,
+                        ""
+                        if line is not None
+                        else "\nNo output for {0} seconds".format(self._timeout),
+                    )
+                )
+            if line.startswith(sentinel):
+                break
+            if line.startswith(b":-"):
+                header.append(line)
+            else:
+                lines.append(line)
+
+        writer.join()
+        out = b"".join(header + lines)
+        if verbose:
+            print("stdout:\n", out.decode(_ENCODING, "replace"), "\n")
+        return out
 
+    def _call_boxer(self, candc_out, verbose=False):
+        """
+        Call the ``boxer`` binary with the given input.
+
+        :param candc_out: bytes output from C&C parser
+        :return: iterator of bytes stdout lines
+        """
         args = [
             "--box",
             "false",
@@ -231,53 +568,97 @@ class Boxer(object):
             "prolog",
             "--instantiate",
             "true",
-            "--input",
-            temp_filename,
         ]
-        stdout = self._call(None, self._boxer_bin, args, verbose)
-        os.remove(temp_filename)
-        return stdout
+        return self._call_lines(candc_out, self._boxer_bin, args, verbose)
 
     def _find_binary(self, name, bin_dir, verbose=False):
-        return find_binary(
-            name,
-            path_to_bin=bin_dir,
-            env_vars=["CANDC"],
-            url="http://svn.ask.it.usyd.edu.au/trac/candc/",
-            binary_names=[name, name + ".exe"],
-            verbose=verbose,
-        )
+        # find_binary() also searches $PATH
+        key = (name, bin_dir, os.environ.get("CANDC"), os.environ.get("PATH"))
+        with _binary_cache_lock:
+            path = _binary_cache.get(key)
+            # the binary may have been removed since it was found
+            if path is None or not os.path.isfile(path):
+                path = _binary_cache[key] = find_binary(
+                    name,
+                    path_to_bin=bin_dir,
+                    env_vars=["CANDC"],
+                    url="http://svn.ask.it.usyd.edu.au/trac/candc/",
+                    binary_names=[name, name + ".exe"],
+                    verbose=verbose,
+                )
+            elif verbose:
+                print("[Found %s: %s]" % (name, path))
+            return path
 
     def _call(self, input_str, binary, args=[], verbose=False):
         """
         Call the binary with the given input.
 
-        :param input_str: A string whose contents are used as stdin.
+        :param input_str: A str or bytes whose contents are used as stdin.
         :param binary: The location of the binary to call
         :param args: A list of command-line arguments.
-        :return: stdout
+        :return: bytes stdout
+        """
+        return b"".join(self._call_lines(input_str, binary, args, verbose))
+
+    def _call_lines(self, input_str, binary, args=[], verbose=False):
+        """
+        Call the binary with the given input, yielding its output line by
+        line as it is produced.
+
+        :param input_str: A str or bytes whose contents are used as stdin.
+        :param binary: The location of the binary to call
+        :param args: A list of command-line arguments.
+        :return: iterator of bytes stdout lines
         """
+        cmd = [binary] + args
         if verbose:
             print("Calling:", binary)
             print("Args:", args)
-            print("Input:", input_str)
-            print("Command:", binary + " " + " ".join(args))
+            if isinstance(input_str, bytes):
+                print("Input:", input_str.decode(_ENCODING, "replace"))
+            else:
+                print("Input:", input_str)
+            print("Command:", " ".join(shlex.quote(arg) for arg in cmd))
 
-        # Call via a subprocess
-        if input_str is None:
-            cmd = [binary] + args
-            p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        else:
-            cmd = 'echo "{0}" | {1} {2}'.format(input_str, binary, " ".join(args))
-            p = subprocess.Popen(
-                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True
-            )
-        stdout, stderr = p.communicate()
+        if isinstance(input_str, str):
+            input_str = input_str.encode(_ENCODING)
+
+        # Call via a subprocess.  stdin and stderr are serviced by threads so
+        # that neither pipe can fill up while stdout is being read.
+        p = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        stderr = []
+        threads = [
+            threading.Thread(target=_write_and_close, args=(p.stdin, input_str)),
+            threading.Thread(target=lambda: stderr.append(p.stderr.read())),
+        ]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
 
+        finished = False
+        try:
+            if verbose:
+                print("stdout:")
+            for line in p.stdout:
+                if verbose:
+                    print(line.decode(_ENCODING, "replace"), end="")
+                yield line
+            finished = True
+        finally:
+            if not finished:
+                p.kill()
+            for thread in threads:
+                thread.join()
+            p.stdout.close()
+            p.stderr.close()
+            p.wait()
+
+        stderr = b"".join(stderr).decode(_ENCODING, "replace")
         if verbose:
             print("Return code:", p.returncode)
-            if stdout:
-                print("stdout:\n", stdout, "\n")
             if stderr:
                 print("stderr:\n", stderr, "\n")
         if p.returncode != 0:
@@ -287,52 +668,130 @@ class Boxer(object):
                 )
             )
 
-        return stdout
-
     def _parse_to_drs_dict(self, boxer_out, use_disc_id):
-        lines = boxer_out.split("\n")
-        drs_dict = {}
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            if line.startswith("id("):
-                comma_idx = line.index(",")
-                discourse_id = line[3:comma_idx]
+        """
+        :param boxer_out: str, bytes or iterable of bytes lines of ``boxer`` output
+        :return: dict from discourse id to ``drt.DrtExpression``
+        """
+        if isinstance(boxer_out, str):
+            boxer_out = boxer_out.encode(_ENCODING)
+        if isinstance(boxer_out, bytes):
+            boxer_out = boxer_out.split(b"\n")
+        return dict(self._parse_drs_lines(boxer_out, use_disc_id))
+
+    def _parse_drs_lines(self, lines, use_disc_id):
+        """
+        Parse each DRS in ``boxer`` output as soon as its lines are read.
+
+        :param lines: iterable of bytes lines of ``boxer`` output
+        :return: iterator of (discourse id, ``drt.DrtExpression``) pairs
+        """
+        # parse() resets the parser, so one instance serves every DRS
+        parser = BoxerOutputDrsParser()
+        lines = iter(lines)
+        for line in lines:
+            if line.startswith(b"id("):
+                comma_idx = line.index(b",")
+                discourse_id = line[3:comma_idx].decode(_ENCODING)
                 if discourse_id[0] == "'" and discourse_id[-1] == "'":
                     discourse_id = discourse_id[1:-1]
-                drs_id = line[comma_idx + 1 : line.index(")")]
-                i += 1
-                line = lines[i]
-                assert line.startswith("sem({0},".format(drs_id))
-                if line[-4:] == "').'":
-                    line = line[:-4] + ")."
-                assert line.endswith(")."), "can't parse line: {0}".format(line)
-
-                search_start = len("sem({0},[".format(drs_id))
+                drs_id = line[comma_idx + 1 : line.index(b")")]
+                line = next(lines, b"").rstrip(b"\n")
+                sem_prefix = b"sem(" + drs_id + b",["
+                assert line.startswith(sem_prefix)
+                if line[-4:] == b"').'":
+                    line = line[:-4] + b")."
+                assert line.endswith(b")."), "can't parse line: {0}".format(line)
+
+                search_start = len(sem_prefix)
                 brace_count = 1
                 drs_start = -1
-                for j, c in enumerate(line[search_start:]):
-                    if c == "[":
+                for bracket in _BRACKET_RE.finditer(line, search_start):
+                    if bracket.group() == b"[":
                         brace_count += 1
-                    if c == "]":
+                    else:
                         brace_count -= 1
                         if brace_count == 0:
-                            drs_start = search_start + j + 1
-                            if line[drs_start : drs_start + 3] == "','":
+                            drs_start = bracket.end()
+                            if line[drs_start : drs_start + 3] == b"','":
                                 drs_start = drs_start + 3
                             else:
                                 drs_start = drs_start + 1
                             break
                 assert drs_start > -1
 
-                drs_input = line[drs_start:-2].strip()
-                parsed = self._parse_drs(drs_input, discourse_id, use_disc_id)
-                drs_dict[discourse_id] = self._boxer_drs_interpreter.interpret(parsed)
-            i += 1
-        return drs_dict
+                drs_input = line[drs_start:-2].strip().decode(_ENCODING)
+                parsed = self._parse_drs(drs_input, discourse_id, use_disc_id, parser)
+                yield discourse_id, self._boxer_drs_interpreter.interpret(parsed)
+
+    def _parse_drs(self, drs_string, discourse_id, use_disc_id, parser=None):
+        if parser is None:
+            parser = BoxerOutputDrsParser()
+        parser.discourse_id = [None, discourse_id][use_disc_id]
+        return parser.parse(drs_string)
+
+
+def _close(procs, pools):
+    for p, _, _ in procs.values():
+        _stop(p)
+    procs.clear()
+    for pool in pools.values():
+        pool.terminate()
+        pool.join()
+    pools.clear()
 
-    def _parse_drs(self, drs_string, discourse_id, use_disc_id):
-        return BoxerOutputDrsParser([None, discourse_id][use_disc_id]).parse(drs_string)
+
+def _stop(p):
+    if p.poll() is None:
+        p.terminate()
+    p.wait()
+    try:
+        p.stdin.close()
+    except BrokenPipeError:
+        pass
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _read_lines(stream, lines):
+    for line in iter(stream.readline, b""):
+        lines.put(line)
+    stream.close()
+    # end of output
+    lines.put(b"")
+
+
+def _write_and_flush(stream, data):
+    try:
+        stream.write(data)
+        stream.flush()
+    except BrokenPipeError:
+        # the process exited before reading all of its input
+        pass
+
+
+def _write_and_close(stream, data):
+    try:
+        stream.write(data)
+        stream.close()
+    except BrokenPipeError:
+        # the process exited without reading all of its input
+        pass
+
+
+# The ``Boxer`` owned by a worker process of ``Boxer.interpret_multi_sents``
+_worker_boxer = None
+
+
+def _init_worker(boxer):
+    global _worker_boxer
+    _worker_boxer = boxer
+
+
+def _interpret_batch(batch):
+    return _worker_boxer._interpret_batch(*batch)
 
 
 class BoxerOutputDrsParser(DrtParser):
@@ -370,13 +829,38 @@ class BoxerOutputDrsParser(DrtParser):
             raise UnexpectedTokenException(tok)
         return accum
 
+    # Handlers for the tokens that start a DRS
+    _DRS_HANDLERS = {
+        "drs": lambda self: self.parse_drs(),
+        "merge": lambda self: self._handle_binary_expression(
+            self._make_merge_expression
+        )(None, []),
+        "smerge": lambda self: self._handle_binary_expression(
+            self._make_merge_expression
+        )(None, []),
+        "alfa": lambda self: self._handle_alfa(self._make_merge_expression)(None, []),
+    }
+
+    # Handlers for the tokens that start a DRS condition.  Each returns a list
+    # of functions from (sent_index, word_indices) to a condition.
+    _CONDITION_HANDLERS = {
+        "or": lambda self: [self._handle_binary_expression(self._make_or_expression)],
+        "imp": lambda self: [self._handle_binary_expression(self._make_imp_expression)],
+        "eq": lambda self: [self._handle_eq()],
+        "prop": lambda self: [self._handle_prop()],
+        "pred": lambda self: [self._handle_pred()],
+        "named": lambda self: [self._handle_named()],
+        "rel": lambda self: [self._handle_rel()],
+        "timex": lambda self: self._handle_timex(),
+        "card": lambda self: [self._handle_card()],
+        "whq": lambda self: [self._handle_whq()],
+        "duplex": lambda self: [self._handle_duplex()],
+    }
+
     def handle_drs(self, tok):
-        if tok == "drs":
-            return self.parse_drs()
-        elif tok in ["merge", "smerge"]:
-            return self._handle_binary_expression(self._make_merge_expression)(None, [])
-        elif tok in ["alfa"]:
-            return self._handle_alfa(self._make_merge_expression)(None, [])
+        handler = self._DRS_HANDLERS.get(tok)
+        if handler is not None:
+            return handler(self)
 
     def handle_condition(self, tok, indices):
         """
@@ -388,33 +872,8 @@ class BoxerOutputDrsParser(DrtParser):
         if tok == "not":
             return [self._handle_not()]
 
-        if tok == "or":
-            conds = [self._handle_binary_expression(self._make_or_expression)]
-        elif tok == "imp":
-            conds = [self._handle_binary_expression(self._make_imp_expression)]
-        elif tok == "eq":
-            conds = [self._handle_eq()]
-        elif tok == "prop":
-            conds = [self._handle_prop()]
-
-        elif tok == "pred":
-            conds = [self._handle_pred()]
-        elif tok == "named":
-            conds = [self._handle_named()]
-        elif tok == "rel":
-            conds = [self._handle_rel()]
-        elif tok == "timex":
-            conds = self._handle_timex()
-        elif tok == "card":
-            conds = [self._handle_card()]
-
-        elif tok == "whq":
-            conds = [self._handle_whq()]
-        elif tok == "duplex":
-            conds = [self._handle_duplex()]
-
-        else:
-            conds = []
+        handler = self._CONDITION_HANDLERS.get(tok)
+        conds = handler(self) if handler is not None else []
 
         return sum(
             [
@@ -664,6 +1123,26 @@ class BoxerOutputDrsParser(DrtParser):
 
     def _parse_index_list(self):
         # [1001,1002]:
+        # Index lists are the most common construct in Boxer's output, so
+        # read their tokens straight from the buffer instead of through
+        # token(); anything unexpected is left to the checks below.
+        buffer = self._buffer
+        i = self._currentIndex
+        try:
+            if buffer[i] == "[":
+                indices = []
+                i += 1
+                while buffer[i] != "]":
+                    indices.append(int(buffer[i]))
+                    i += 1
+                    if buffer[i] == ",":
+                        i += 1
+                if buffer[i + 1] == ":":
+                    self._currentIndex = i + 2
+                    return indices
+        except (IndexError, ValueError):
+            pass
+
         indices = []
         self.assertToken(self.token(), "[")
         while self.token(0) != "]":
@@ -773,7 +1252,7 @@ class BoxerOutputDrsParser(DrtParser):
 
     def parse_variable(self):
         var = self.token()
-        assert re.match("^[exps]\d+$", var), var
+        assert re.match(r"^[exps]\d+$", var), var
         return var
 
     def parse_index(self):
@@ -783,20 +1262,38 @@ class BoxerOutputDrsParser(DrtParser):
         """
         :return: list of (sent_index, word_indices) tuples
         """
-        sent_indices = set((i / 1000) - 1 for i in indices if i >= 0)
+        decoded = [_decode_index(i) for i in indices]
+        sent_indices = set(s for i, (s, w) in zip(indices, decoded) if i >= 0)
         if sent_indices:
             pairs = []
             for sent_index in sent_indices:
-                word_indices = [
-                    (i % 1000) - 1 for i in indices if sent_index == (i / 1000) - 1
-                ]
+                word_indices = [w for s, w in decoded if s == sent_index]
                 pairs.append((sent_index, word_indices))
             return pairs
         else:
-            word_indices = [(i % 1000) - 1 for i in indices]
+            word_indices = [w for s, w in decoded]
             return [(None, word_indices)]
 
 
+# Maps Boxer's indices to (sentence, word) pairs; see ``_decode_index``
+_index_cache = {}
+
+
+def _decode_index(index):
+    """
+    Split a Boxer index, ``1000 * sentence + word`` with both counted from 1,
+    into a 0-based (sentence, word) pair.
+    """
+    pair = _index_cache.get(index)
+    if pair is None:
+        sent, word = divmod(index, 1000)
+        pair = (sent - 1, word - 1)
+        # indices from very long discourses are rare and not worth keeping
+        if 0 <= index < 100000:
+            _index_cache[index] = pair
+    return pair
+
+
 class BoxerDrsParser(DrtParser):
     """
     Reparse the str form of subclasses of ``AbstractBoxerDrs``
@@ -1058,7 +1555,12 @@ class BoxerDrs(AbstractBoxerDrs):
 
     def clean(self):
         consequent = self.consequent.clean() if self.consequent else None
-        return BoxerDrs(self.refs, [c.clean() for c in self.conds], consequent)
+        conds = [c.clean() for c in self.conds]
+        if consequent is self.consequent and all(
+            c is old for c, old in zip(conds, self.conds)
+        ):
+            return self
+        return BoxerDrs(self.refs, conds, consequent)
 
     def renumber_sentences(self, f):
         consequent = self.consequent.renumber_sentences(f) if self.consequent else None
@@ -1104,7 +1606,10 @@ class BoxerNot(AbstractBoxerDrs):
         return self.drs.atoms()
 
     def clean(self):
-        return BoxerNot(self.drs.clean())
+        drs = self.drs.clean()
+        if drs is self.drs:
+            return self
+        return BoxerNot(drs)
 
     def renumber_sentences(self, f):
         return BoxerNot(self.drs.renumber_sentences(f))
@@ -1180,12 +1685,15 @@ class BoxerPred(BoxerIndexed):
         )
 
     def clean(self):
+        name = self._clean_name(self.name)
+        if name == self.name:
+            return self
         return BoxerPred(
             self.discourse_id,
             self.sent_index,
             self.word_indices,
             self.var,
-            self._clean_name(self.name),
+            name,
             self.pos,
             self.sense,
         )
@@ -1232,12 +1740,15 @@ class BoxerNamed(BoxerIndexed):
         )
 
     def clean(self):
+        name = self._clean_name(self.name)
+        if name == self.name:
+            return self
         return BoxerNamed(
             self.discourse_id,
             self.sent_index,
             self.word_indices,
             self.var,
-            self._clean_name(self.name),
+            name,
             self.type,
             self.sense,
         )
@@ -1272,13 +1783,16 @@ class BoxerRel(BoxerIndexed):
         return (set([self.var1, self.var2]), set(), set())
 
     def clean(self):
+        rel = self._clean_name(self.rel)
+        if rel == self.rel:
+            return self
         return BoxerRel(
             self.discourse_id,
             self.sent_index,
             self.word_indices,
             self.var1,
             self.var2,
-            self._clean_name(self.rel),
+            rel,
             self.sense,
         )
 
@@ -1318,12 +1832,11 @@ class BoxerProp(BoxerIndexed):
         return self.drs.atoms()
 
     def clean(self):
+        drs = self.drs.clean()
+        if drs is self.drs:
+            return self
         return BoxerProp(
-            self.discourse_id,
-            self.sent_index,
-            self.word_indices,
-            self.var,
-            self.drs.clean(),
+            self.discourse_id, self.sent_index, self.word_indices, self.var, drs
         )
 
     def renumber_sentences(self, f):
@@ -1410,12 +1923,12 @@ class BoxerOr(BoxerIndexed):
         return self.drs1.atoms() | self.drs2.atoms()
 
     def clean(self):
+        drs1 = self.drs1.clean()
+        drs2 = self.drs2.clean()
+        if drs1 is self.drs1 and drs2 is self.drs2:
+            return self
         return BoxerOr(
-            self.discourse_id,
-            self.sent_index,
-            self.word_indices,
-            self.drs1.clean(),
-            self.drs2.clean(),
+            self.discourse_id, self.sent_index, self.word_indices, drs1, drs2
         )
 
     def renumber_sentences(self, f):
@@ -1458,14 +1971,18 @@ class BoxerWhq(BoxerIndexed):
         return self.drs1.atoms() | self.drs2.atoms()
 
     def clean(self):
+        drs1 = self.drs1.clean()
+        drs2 = self.drs2.clean()
+        if drs1 is self.drs1 and drs2 is self.drs2:
+            return self
         return BoxerWhq(
             self.discourse_id,
             self.sent_index,
             self.word_indices,
             self.ans_types,
-            self.drs1.clean(),
+            drs1,
             self.variable,
-            self.drs2.clean(),
+            drs2,
         )
 
     def renumber_sentences(self, f):
@@ -1502,44 +2019,74 @@ class NltkDrtBoxerDrsInterpreter(object):
         :param ex: ``AbstractBoxerDrs``
         :return: ``DrtExpression``
         """
-        if isinstance(ex, BoxerDrs):
-            drs = DRS(
-                [Variable(r) for r in ex.refs], list(map(self.interpret, ex.conds))
-            )
-            if ex.consequent is not None:
-                drs.consequent = self.interpret(ex.consequent)
-            return drs
-        elif isinstance(ex, BoxerNot):
-            return DrtNegatedExpression(self.interpret(ex.drs))
-        elif isinstance(ex, BoxerPred):
-            pred = self._add_occur_indexing("%s_%s" % (ex.pos, ex.name), ex)
-            return self._make_atom(pred, ex.var)
-        elif isinstance(ex, BoxerNamed):
-            pred = self._add_occur_indexing("ne_%s_%s" % (ex.type, ex.name), ex)
-            return self._make_atom(pred, ex.var)
-        elif isinstance(ex, BoxerRel):
-            pred = self._add_occur_indexing("%s" % (ex.rel), ex)
-            return self._make_atom(pred, ex.var1, ex.var2)
-        elif isinstance(ex, BoxerProp):
-            return DrtProposition(Variable(ex.var), self.interpret(ex.drs))
-        elif isinstance(ex, BoxerEq):
-            return DrtEqualityExpression(
-                DrtVariableExpression(Variable(ex.var1)),
-                DrtVariableExpression(Variable(ex.var2)),
+        handler = self._INTERPRETERS.get(type(ex))
+        if handler is None:
+            # subclasses of the Boxer DRS classes
+            handler = next(
+                (h for cls, h in self._INTERPRETERS.items() if isinstance(ex, cls)),
+                None,
             )
-        elif isinstance(ex, BoxerCard):
-            pred = self._add_occur_indexing("card_%s_%s" % (ex.type, ex.value), ex)
-            return self._make_atom(pred, ex.var)
-        elif isinstance(ex, BoxerOr):
-            return DrtOrExpression(self.interpret(ex.drs1), self.interpret(ex.drs2))
-        elif isinstance(ex, BoxerWhq):
-            drs1 = self.interpret(ex.drs1)
-            drs2 = self.interpret(ex.drs2)
-            return DRS(drs1.refs + drs2.refs, drs1.conds + drs2.conds)
-        assert False, "%s: %s" % (ex.__class__.__name__, ex)
+            if handler is None:
+                raise ValueError("%s: %s" % (ex.__class__.__name__, ex))
+        return handler(self, ex)
+
+    def _interpret_drs(self, ex):
+        drs = DRS([Variable(r) for r in ex.refs], list(map(self.interpret, ex.conds)))
+        if ex.consequent is not None:
+            drs.consequent = self.interpret(ex.consequent)
+        return drs
+
+    def _interpret_pred(self, ex):
+        pred = self._add_occur_indexing("%s_%s" % (ex.pos, ex.name), ex)
+        return self._make_constant_atom(pred, ex.var)
+
+    def _interpret_named(self, ex):
+        pred = self._add_occur_indexing("ne_%s_%s" % (ex.type, ex.name), ex)
+        return self._make_constant_atom(pred, ex.var)
+
+    def _interpret_rel(self, ex):
+        pred = self._add_occur_indexing("%s" % (ex.rel), ex)
+        return self._make_atom(pred, ex.var1, ex.var2)
+
+    def _interpret_card(self, ex):
+        pred = self._add_occur_indexing("card_%s_%s" % (ex.type, ex.value), ex)
+        return self._make_constant_atom(pred, ex.var)
+
+    def _interpret_whq(self, ex):
+        drs1 = self.interpret(ex.drs1)
+        drs2 = self.interpret(ex.drs2)
+        return DRS(drs1.refs + drs2.refs, drs1.conds + drs2.conds)
+
+    # Handlers for each Boxer DRS class, looked up by the exact type
+    _INTERPRETERS = {
+        BoxerDrs: lambda self, ex: self._interpret_drs(ex),
+        BoxerNot: lambda self, ex: DrtNegatedExpression(self.interpret(ex.drs)),
+        BoxerPred: lambda self, ex: self._interpret_pred(ex),
+        BoxerNamed: lambda self, ex: self._interpret_named(ex),
+        BoxerRel: lambda self, ex: self._interpret_rel(ex),
+        BoxerProp: lambda self, ex: DrtProposition(
+            Variable(ex.var), self.interpret(ex.drs)
+        ),
+        BoxerEq: lambda self, ex: DrtEqualityExpression(
+            DrtVariableExpression(Variable(ex.var1)),
+            DrtVariableExpression(Variable(ex.var2)),
+        ),
+        BoxerCard: lambda self, ex: self._interpret_card(ex),
+        BoxerOr: lambda self, ex: DrtOrExpression(
+            self.interpret(ex.drs1), self.interpret(ex.drs2)
+        ),
+        BoxerWhq: lambda self, ex: self._interpret_whq(ex),
+    }
 
     def _make_atom(self, pred, *args):
-        accum = DrtVariableExpression(Variable(pred))
+        return self._apply_to_variables(DrtVariableExpression(Variable(pred)), args)
+
+    def _make_constant_atom(self, pred, *args):
+        # ``pred`` contains an underscore, so it can only name a constant and
+        # the variable-type checks of ``DrtVariableExpression`` can be skipped
+        return self._apply_to_variables(DrtConstantExpression(Variable(pred)), args)
+
+    def _apply_to_variables(self, accum, args):
         for arg in args:
             accum = DrtApplicationExpression(
                 accum, DrtVariableExpression(Variable(arg))
@@ -1547,12 +2094,16 @@ class NltkDrtBoxerDrsInterpreter(object):
         return accum
 
     def _add_occur_indexing(self, base, ex):
-        if self._occur_index and ex.sent_index is not None:
-            if ex.discourse_id:
-                base += "_%s" % ex.discourse_id
-            base += "_s%s" % ex.sent_index
-            base += "_w%s" % sorted(ex.word_indices)[0]
-        return base
+        if not self._occur_index or ex.sent_index is None:
+            return base
+        if ex.discourse_id:
+            return "%s_%s_s%s_w%s" % (
+                base,
+                ex.discourse_id,
+                ex.sent_index,
+                min(ex.word_indices),
+            )
+        return "%s_s%s_w%s" % (base, ex.sent_index, min(ex.word_indices))
 
 
 class UnparseableInputException(Exception):
@@ -0,0 +1,407 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for parsing Boxer output in nltk.sem.boxer
+
+The Boxer output is canned, so neither ``candc`` nor ``boxer`` is needed.
+"""
+
+import contextlib
+import io
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import unittest
+
+from nltk.sem.boxer import (
+    Boxer,
+    BoxerNamed,
+    BoxerPred,
+    NltkDrtBoxerDrsInterpreter,
+    PassthroughBoxerDrsInterpreter,
+)
+
+# "John barks. New York sleeps." and "Two dogs."
+BOXER_OUTPUT = """\
+:- multifile sem/3, id/2.
+
+id('d1',1).
+sem(1,[1001:[tok:'John',pos:'NNP'],1002:[tok:barks,pos:'VBZ'],2001:[tok:'New',pos:'NNP'],2002:[tok:'York',pos:'NNP'],2003:[tok:sleeps,pos:'VBZ']],drs([[1001]:x0,[1002]:e1,[2001,2002]:x2,[2003]:e3],[[1001]:named(x0,john,per,0),[1002]:pred(e1,bark,v,0),[1002]:rel(e1,x0,agent,0),[2001,2002]:named(x2,new_york,loc,0),[2003]:pred(e3,sleep,v,0),[]:not(drs([],[[2003]:pred(x2,big,a,0)]))])).
+
+id('d2',2).
+sem(2,[1001:[tok:'Two',pos:'CD'],1002:[tok:dogs,pos:'NNS']],drs([[1002]:x0],[[1001]:card(x0,2,eq),[1002]:pred(x0,dog,n,0)])).
+"""
+
+
+class TestBoxerOutputParsing(unittest.TestCase):
+    def setUp(self):
+        # Boxer only checks that its binaries exist
+        self.bin_dir = tempfile.mkdtemp()
+        for name in ("candc", "boxer"):
+            open(os.path.join(self.bin_dir, name), "w").close()
+
+    def tearDown(self):
+        shutil.rmtree(self.bin_dir)
+
+    def parse(self, interpreter, use_disc_id):
+        boxer = Boxer(interpreter, bin_dir=self.bin_dir)
+        return boxer._parse_to_drs_dict(BOXER_OUTPUT, use_disc_id)
+
+    def assertDrs(self, drs, refs, conds):
+        self.assertEqual(set(str(ref) for ref in drs.refs), set(refs))
+        self.assertEqual([str(cond) for cond in drs.conds], conds)
+
+    def test_plain(self):
+        drss = self.parse(NltkDrtBoxerDrsInterpreter(), False)
+        self.assertEqual(sorted(drss), ["d1", "d2"])
+        self.assertDrs(
+            drss["d1"],
+            ["x0", "e1", "x2", "e3"],
+            [
+                "ne_per_john(x0)",
+                "v_bark(e1)",
+                "agent(e1,x0)",
+                "ne_loc_new_york(x2)",
+                "v_sleep(e3)",
+                "-([],[a_big(x2)])",
+            ],
+        )
+        self.assertDrs(drss["d2"], ["x0"], ["card_eq_2(x0)", "n_dog(x0)"])
+
+    def test_occur_index(self):
+        drss = self.parse(NltkDrtBoxerDrsInterpreter(occur_index=True), False)
+        self.assertDrs(
+            drss["d1"],
+            ["x0", "e1", "x2", "e3"],
+            [
+                "ne_per_john_s0_w0(x0)",
+                "v_bark_s0_w1(e1)",
+                "agent_s0_w1(e1,x0)",
+                # one atom for the two words of "New York", in sentence 1
+                "ne_loc_new_york_s1_w0(x2)",
+                "v_sleep_s1_w2(e3)",
+                "-([],[a_big_s1_w2(x2)])",
+            ],
+        )
+        self.assertDrs(drss["d2"], ["x0"], ["card_eq_2_s0_w0(x0)", "n_dog_s0_w1(x0)"])
+
+    def test_occur_index_with_discourse_id(self):
+        drss = self.parse(NltkDrtBoxerDrsInterpreter(occur_index=True), True)
+        self.assertEqual(
+            [str(cond) for cond in drss["d1"].conds][:4],
+            [
+                "ne_per_john_d1_s0_w0(x0)",
+                "v_bark_d1_s0_w1(e1)",
+                "agent_d1_s0_w1(e1,x0)",
+                "ne_loc_new_york_d1_s1_w0(x2)",
+            ],
+        )
+        self.assertDrs(
+            drss["d2"], ["x0"], ["card_eq_2_d2_s0_w0(x0)", "n_dog_d2_s0_w1(x0)"]
+        )
+
+    def test_indices(self):
+        drss = self.parse(PassthroughBoxerDrsInterpreter(), True)
+        named = drss["d1"].conds[3]
+        self.assertIsInstance(named, BoxerNamed)
+        self.assertEqual(named.discourse_id, "d1")
+        self.assertEqual(named.sent_index, 1)
+        self.assertIsInstance(named.sent_index, int)
+        self.assertEqual(named.word_indices, [0, 1])
+        self.assertEqual(named.var, "x2")
+        self.assertEqual(named.name, "new_york")
+
+
+class TestNltkDrtBoxerDrsInterpreter(unittest.TestCase):
+    def test_subclass(self):
+        class Pred(BoxerPred):
+            pass
+
+        pred = Pred(None, None, [], "x0", "dog", "n", 0)
+        self.assertEqual(str(NltkDrtBoxerDrsInterpreter().interpret(pred)), "n_dog(x0)")
+
+    def test_unknown_type(self):
+        with self.assertRaisesRegex(ValueError, "^object: "):
+            NltkDrtBoxerDrsInterpreter().interpret(object())
+
+
+# Stands in for candc: prints a directive on startup, echoes each <META> line
+# as an id/2 fact, and each sentence as a ccg/2 fact.  Every run and every
+# input line are logged.
+FAKE_CANDC = """\
+#!{python}
+import sys
+
+log = open({log!r}, "a")
+log.write("started\\n")
+log.flush()
+# block buffered, as a C++ program writing to a pipe normally is
+out = open(sys.stdout.fileno(), "w", closefd=False)
+out.write(":- op(601, xfx, (/)).\\n")
+n = 0
+for line in sys.stdin:
+    log.write(line)
+    log.flush()
+    line = line.rstrip("\\n")
+    if line.startswith("<META>"):
+        out.write("id(%s, [%d]).\\n" % (line[6:], n + 1))
+    elif line:
+        n += 1
+        out.write("ccg(%d, %r).\\n" % (n, line))
+    if {flush!r}:
+        out.flush()
+"""
+
+# Stands in for boxer: gives each discourse a DRS with a single predicate,
+# made from the letters of its first sentence, unless that sentence contains
+# "fail".  Input without candc's directives gives no output at all.
+FAKE_BOXER = """\
+#!{python}
+import ast
+import re
+import sys
+
+data = sys.stdin.read()
+if not data.startswith(":-"):
+    sys.exit(0)
+k = 0
+discourse_id = None
+for line in data.splitlines():
+    if line.startswith("id("):
+        discourse_id = line[3 : line.index(",")]
+    elif line.startswith("ccg(") and discourse_id is not None:
+        text = ast.literal_eval(line.split(", ", 1)[1][:-2])
+        if "fail" not in text:
+            k += 1
+            print("id(%s,%d)." % (discourse_id, k))
+            print(
+                "sem(%d,[1001:[tok:x]],drs([[1001]:x0],[[1001]:pred(x0,%s,n,0)]))."
+                % (k, re.sub("[^a-z]", "", text.lower()))
+            )
+        discourse_id = None
+"""
+
+
+@unittest.skipIf(os.name == "nt", "the fake binaries are scripts")
+class TestBoxerWithFakeBinaries(unittest.TestCase):
+    def setUp(self):
+        self.bin_dir = tempfile.mkdtemp()
+        self.log = os.path.join(self.bin_dir, "candc.log")
+        self.write_binaries()
+
+    def tearDown(self):
+        shutil.rmtree(self.bin_dir)
+
+    def write_binaries(self, flush=True):
+        for name, script in (("candc", FAKE_CANDC), ("boxer", FAKE_BOXER)):
+            path = os.path.join(self.bin_dir, name)
+            with open(path, "w") as f:
+                f.write(script.format(python=sys.executable, log=self.log, flush=flush))
+            os.chmod(path, 0o755)
+
+    def boxer(self, **kwargs):
+        boxer = Boxer(bin_dir=self.bin_dir, **kwargs)
+        self.addCleanup(boxer.close)
+        return boxer
+
+    def candc_runs(self):
+        if not os.path.exists(self.log):
+            return 0
+        with open(self.log) as f:
+            return f.read().count("started\n")
+
+    def assertPreds(self, drss, preds):
+        self.assertEqual(
+            [None if drs is None else str(drs) for drs in drss],
+            [None if pred is None else "([x0],[n_%s(x0)])" % pred for pred in preds],
+        )
+
+    def test_one_shot(self):
+        boxer = self.boxer()
+        self.assertPreds(boxer.interpret_sents(["dog", "cat"]), ["dog", "cat"])
+        self.assertPreds(boxer.interpret_sents(["cow"]), ["cow"])
+        self.assertEqual(self.candc_runs(), 2)
+
+    def test_persistent(self):
+        boxer = self.boxer(persistent=True)
+        self.assertPreds(boxer.interpret_sents(["dog", "cat"]), ["dog", "cat"])
+        # the second batch only parses if candc's directives are replayed
+        self.assertPreds(boxer.interpret_sents(["cow"]), ["cow"])
+        self.assertEqual(self.candc_runs(), 1)
+        boxer.close()
+        self.assertEqual(boxer._candc_procs, {})
+
+    def test_persistent_discourse_ids(self):
+        boxer = self.boxer(persistent=True)
+        drss = boxer.interpret_sents(["dog", "cat"], discourse_ids=["__END__", "x"])
+        self.assertPreds(drss, ["dog", "cat"])
+        self.assertPreds(boxer.interpret_sents(["cow"]), ["cow"])
+
+    def test_persistent_restart(self):
+        boxer = self.boxer(persistent=True)
+        self.assertPreds(boxer.interpret_sents(["dog"]), ["dog"])
+        p = boxer._candc_procs[False][0]
+        p.kill()
+        p.wait()
+        self.assertPreds(boxer.interpret_sents(["cat"]), ["cat"])
+        self.assertEqual(self.candc_runs(), 2)
+
+    def test_persistent_timeout(self):
+        # a candc whose stdout is block buffered never prints the end of a
+        # batch while it waits for more input
+        self.write_binaries(flush=False)
+        self.assertPreds(self.boxer().interpret_sents(["dog"]), ["dog"])
+        boxer = self.boxer(persistent=True, timeout=0.5)
+        with self.assertRaisesRegex(Exception, "No output for 0.5 seconds"):
+            boxer.interpret_sents(["dog"])
+        self.assertEqual(boxer._candc_procs, {})
+
+    def test_shell_characters(self):
+        sentence = """a "dog" $HOME `barks` it's \\$ ; | &"""
+        for persistent in (False, True):
+            boxer = self.boxer(persistent=persistent)
+            self.assertPreds(boxer.interpret_sents([sentence]), ["adoghomebarksits"])
+        with open(self.log) as f:
+            self.assertEqual(f.read().count(sentence), 2)
+
+    def test_verbose(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.boxer().interpret_sents(["dog"], verbose=True)
+        # the input to boxer is bytes, but is shown as text
+        self.assertIn("Input: :- op(601, xfx, (/)).", out.getvalue())
+        self.assertNotIn("b':-", out.getvalue())
+
+    def test_batches(self):
+        boxer = self.boxer()
+        drss = boxer.interpret_sents(["dog", "cat", "cow", "pig", "hen"], batch_size=2)
+        self.assertPreds(drss, ["dog", "cat", "cow", "pig", "hen"])
+        self.assertEqual(self.candc_runs(), 3)
+
+    def test_n_jobs(self):
+        boxer = self.boxer()
+        words = ["dog", "cat", "cow", "pig", "hen"]
+        self.assertPreds(boxer.interpret_sents(words, batch_size=1, n_jobs=2), words)
+        pool = boxer._pools[2]
+        drss = boxer.interpret_multi_sents_iter([[w] for w in words], n_jobs=2)
+        self.assertPreds(list(drss), words)
+        # the workers are reused
+        self.assertIs(boxer._pools[2], pool)
+        self.assertEqual(self.candc_runs(), 7)
+        boxer.close()
+        self.assertEqual(boxer._pools, {})
+
+    def test_n_jobs_persistent(self):
+        boxer = self.boxer(persistent=True)
+        words = ["dog", "cat", "cow", "pig", "hen"]
+        for _ in range(2):
+            drss = boxer.interpret_sents(words, batch_size=1, n_jobs=2)
+            self.assertPreds(drss, words)
+        # at most one candc for each worker
+        self.assertLessEqual(self.candc_runs(), 2)
+
+    def test_bad_arguments(self):
+        boxer = self.boxer()
+        for n_jobs in (0, -1, 1.5, True, None):
+            with self.assertRaisesRegex(ValueError, "n_jobs"):
+                boxer.interpret_sents(["dog"], n_jobs=n_jobs)
+            with self.assertRaisesRegex(ValueError, "n_jobs"):
+                boxer.interpret_multi_sents_iter([["dog"]], n_jobs=n_jobs)
+        for batch_size in (0, -1, 1.5, True):
+            with self.assertRaisesRegex(ValueError, "batch_size"):
+                boxer.interpret_sents(["dog"], batch_size=batch_size)
+        self.assertEqual(self.candc_runs(), 0)
+
+    def test_pickle(self):
+        boxer = self.boxer(persistent=True)
+        self.assertPreds(boxer.interpret_sents(["dog"]), ["dog"])
+        copy = pickle.loads(pickle.dumps(boxer))
+        self.addCleanup(copy.close)
+        # the running candc stays with the original
+        self.assertEqual(copy._candc_procs, {})
+        self.assertPreds(copy.interpret_sents(["cat"]), ["cat"])
+        self.assertPreds(boxer.interpret_sents(["cow"]), ["cow"])
+        self.assertEqual(self.candc_runs(), 2)
+
+    def test_find_binary(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            for _ in range(2):
+                Boxer(bin_dir=self.bin_dir, verbose=True)
+        candc = os.path.join(self.bin_dir, "candc")
+        # found once, then taken from the cache
+        self.assertEqual(out.getvalue().count(": %s]" % candc), 2)
+
+    def test_find_binary_on_path(self):
+        path = os.environ.get("PATH", "")
+        self.addCleanup(os.environ.__setitem__, "PATH", path)
+        candc_env = os.environ.pop("CANDC", None)
+        if candc_env is not None:
+            self.addCleanup(os.environ.__setitem__, "CANDC", candc_env)
+        os.environ["PATH"] = self.bin_dir + os.pathsep + path
+        candc = os.path.join(self.bin_dir, "candc")
+        self.assertEqual(Boxer()._candc_bin, candc)
+        # a binary found before is searched for again once it is gone
+        os.remove(candc)
+        other_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, other_dir)
+        shutil.copy(os.path.join(self.bin_dir, "boxer"), other_dir)
+        shutil.copy(
+            os.path.join(self.bin_dir, "boxer"), os.path.join(other_dir, "candc")
+        )
+        os.environ["PATH"] = other_dir + os.pathsep + path
+        self.assertEqual(Boxer()._candc_bin, os.path.join(other_dir, "candc"))
+
+    def test_cache(self):
+        boxer = self.boxer(cache_size=2)
+        drs = boxer.interpret("dog")
+        drs.conds.append(drs.conds[0])
+        # a hit gives a fresh copy of the DRS
+        self.assertPreds([boxer.interpret("dog")], ["dog"])
+        self.assertIsNot(boxer.interpret("dog"), boxer.interpret("dog"))
+        self.assertEqual(self.candc_runs(), 1)
+        # only the misses are parsed
+        self.assertPreds(boxer.interpret_sents(["dog", "cat"]), ["dog", "cat"])
+        self.assertEqual(self.candc_runs(), 2)
+        with open(self.log) as f:
+            self.assertNotIn("dog", f.read().split("started\n")[-1])
+
+    def test_cache_eviction(self):
+        boxer = self.boxer(cache_size=2)
+        for word, runs in (
+            ("dog", 1),
+            ("cat", 2),
+            ("dog", 2),
+            # forgets "cat", the least recently used
+            ("cow", 3),
+            ("dog", 3),
+            ("cat", 4),
+        ):
+            self.assertPreds(boxer.interpret_sents([word]), [word])
+            self.assertEqual(self.candc_runs(), runs)
+
+    def test_cache_failures(self):
+        boxer = self.boxer(cache_size=2)
+        for runs in (1, 2):
+            self.assertPreds(boxer.interpret_sents(["fail"]), [None])
+            self.assertEqual(self.candc_runs(), runs)
+
+    def test_cache_keys(self):
+        boxer = self.boxer(cache_size=10)
+        for kwargs, runs in (
+            ({}, 1),
+            ({"question": True}, 2),
+            ({"discourse_ids": ["a"]}, 3),
+            ({"discourse_ids": ["b"]}, 4),
+            ({"discourse_ids": ["a"]}, 4),
+            ({"question": True}, 4),
+            ({}, 4),
+        ):
+            self.assertPreds(boxer.interpret_sents(["dog"], **kwargs), ["dog"])
+            self.assertEqual(self.candc_runs(), runs)
+
+    def test_bad_cache_size(self):
+        for cache_size in (-1, 1.5, True, None):
+            with self.assertRaisesRegex(ValueError, "cache_size"):
+                Boxer(bin_dir=self.bin_dir, cache_size=cache_size)